@@ -8,6 +8,16 @@ Tests HTTPS connectivity using multiple methods:
 - ssl module directly
 
 Outputs JSON results for aggregation.
+
+Usage:
+    check.py [--pretty] [URL] [TIMEOUT]
+    check.py [--pretty] --concurrent-urls URL[,URL...] [TIMEOUT]
+
+With --concurrent-urls, each URL is checked once, concurrently via aiohttp
+(if available) or one after another via requests. Pass "-" instead of a
+list to read URLs from stdin.
+
+JSON is written on a single compact line; --pretty indents it for reading.
 """
 
 import json
@@ -16,19 +26,105 @@ import socket
 import sys
 import time
 import os
-from urllib.request import urlopen, Request
+import platform
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import build_opener, getproxies, proxy_bypass, HTTPSHandler, Request
 from urllib.error import URLError, HTTPError
+from urllib.parse import urlparse
 from datetime import datetime, timezone
 
 
+# Default-verifying SSL context shared by the urllib and ssl socket checks;
+# building one re-parses the system CA bundle, so do it once per process
+_SSL_CTX = ssl.create_default_context()
+
+# Well-known system CA bundle locations, checked once at startup for use in
+# fix suggestions
+_CA_PATHS = [
+    "/etc/ssl/cert.pem",
+    "/etc/ssl/certs/ca-certificates.crt",
+    "/etc/pki/tls/certs/ca-bundle.crt",
+]
+_DETECTED_CA_PATH = next((p for p in _CA_PATHS if os.path.exists(p)), None)
+
+# Cache DNS lookups for the lifetime of the process so urllib, requests and
+# the raw ssl socket all see the same resolution for the target host
+_dnscache = {}
+_getaddrinfo = socket.getaddrinfo
+
+
+def _cached_getaddrinfo(*args, **kwargs):
+    """Resolve via socket.getaddrinfo, reusing earlier results for the same arguments."""
+    key = (args, tuple(sorted(kwargs.items())))
+    try:
+        return _dnscache[key]
+    except KeyError:
+        return _dnscache.setdefault(key, _getaddrinfo(*args, **kwargs))
+
+
+socket.getaddrinfo = _cached_getaddrinfo
+
+
+# Verified TLS connections left open by the ssl socket check, keyed by
+# (host, port), for the urllib check to send its request over; both use the
+# same SSL context, so a second handshake would only repeat the same result
+_OPEN_SOCKETS = {}
+
+# TLS sessions captured by the ssl socket check, keyed by (host, port), so
+# the urllib check can resume them when no open connection is left
+_LAST_SESSION = {}
+
+
+def _connection_key(host, port):
+    """Key for _OPEN_SOCKETS and _LAST_SESSION; hostnames are case-insensitive."""
+    return (host.lower(), port)
+
+
+class _ReusingHTTPSConnection(http.client.HTTPSConnection):
+    """HTTPSConnection that reuses the ssl socket check's connection or TLS session."""
+
+    def connect(self):
+        if self._tunnel_host:
+            return super().connect()
+
+        ssock = _OPEN_SOCKETS.pop(_connection_key(self.host, self.port), None)
+        if ssock is not None:
+            ssock.settimeout(self.timeout)
+            self.sock = ssock
+            return
+
+        session = _LAST_SESSION.get(_connection_key(self.host, self.port))
+        if session is None:
+            return super().connect()
+
+        http.client.HTTPConnection.connect(self)
+        self.sock = self._context.wrap_socket(self.sock, server_hostname=self.host,
+                                              session=session)
+
+
+class _ReusingHTTPSHandler(HTTPSHandler):
+    """urllib HTTPS handler that opens connections with _ReusingHTTPSConnection."""
+
+    def https_open(self, req):
+        return self.do_open(_ReusingHTTPSConnection, req, context=self._context)
+
+
+def _close_open_sockets():
+    """Close any connections left open by the ssl socket check but not reused."""
+    while _OPEN_SOCKETS:
+        _, ssock = _OPEN_SOCKETS.popitem()
+        ssock.close()
+
+
 def get_ssl_info():
     """Get information about Python's SSL configuration."""
     info = {
         "ssl_version": ssl.OPENSSL_VERSION,
         "ssl_version_info": list(ssl.OPENSSL_VERSION_INFO),
         "default_verify_paths": {},
-        "has_sni": hasattr(ssl, 'HAS_SNI') and ssl.HAS_SNI,
-        "has_alpn": hasattr(ssl, 'HAS_ALPN') and ssl.HAS_ALPN,
+        "has_sni": ssl.HAS_SNI,
+        "has_alpn": ssl.HAS_ALPN,
     }
 
     # Get default certificate paths
@@ -58,15 +154,16 @@ def check_with_urllib(url, timeout=10):
         "duration_ms": 0,
     }
 
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
 
     try:
-        # Create SSL context with certificate verification
-        context = ssl.create_default_context()
+        # Use the shared SSL context with certificate verification
+        context = _SSL_CTX
 
-        # Make the request
+        # Make the request, reusing the ssl socket check's connection if any
+        opener = build_opener(_ReusingHTTPSHandler(context=context))
         request = Request(url, headers={"User-Agent": "ssl-diagnostics/1.0"})
-        response = urlopen(request, timeout=timeout, context=context)
+        response = opener.open(request, timeout=timeout)
 
         # Success
         result["success"] = True
@@ -113,10 +210,42 @@ def check_with_urllib(url, timeout=10):
         result["error_type"] = "unknown"
         result["error_message"] = f"Unexpected error: {type(e).__name__}: {e}"
 
-    result["duration_ms"] = int((time.time() - start_time) * 1000)
+    result["duration_ms"] = (time.perf_counter_ns() - start_time) // 1_000_000
     return result
 
 
+# requests is optional and slow to import, so it is imported on first use;
+# None until then, False once it is known to be missing
+_requests = None
+
+# Shared requests session, created on first use so keep-alive connections
+# are reused across calls to the same host
+_SESSION = None
+
+
+def _import_requests():
+    """Return the requests module, importing it on first use, or None if not installed."""
+    global _requests
+    if _requests is None:
+        try:
+            import requests
+            _requests = requests
+        except ImportError:
+            _requests = False
+    return _requests or None
+
+
+def _get_requests_session():
+    """Return the shared requests.Session, creating it on first use."""
+    global _SESSION
+    if _SESSION is None:
+        requests = _import_requests()
+        session = requests.Session()
+        session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=20))
+        _SESSION = session
+    return _SESSION
+
+
 def check_with_requests(url, timeout=10):
     """Test HTTPS connection using requests library (if available)."""
     result = {
@@ -127,18 +256,16 @@ def check_with_requests(url, timeout=10):
         "duration_ms": 0,
     }
 
-    try:
-        import requests
-        from requests.exceptions import SSLError, ConnectionError, Timeout
-    except ImportError:
+    requests = _import_requests()
+    if requests is None:
         result["error_type"] = "runtime_missing"
         result["error_message"] = "requests library not installed"
         return result
 
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
 
     try:
-        response = requests.get(
+        response = _get_requests_session().get(
             url,
             timeout=timeout,
             verify=True,
@@ -147,11 +274,11 @@ def check_with_requests(url, timeout=10):
         result["success"] = True
         result["status_code"] = response.status_code
 
-    except SSLError as e:
+    except requests.exceptions.SSLError as e:
         result["error_type"] = "ssl_error"
         result["error_message"] = f"SSL error: {e}"
 
-    except ConnectionError as e:
+    except requests.exceptions.ConnectionError as e:
         # Check if it's an SSL error wrapped in ConnectionError
         error_str = str(e).lower()
         if "ssl" in error_str or "certificate" in error_str:
@@ -162,7 +289,7 @@ def check_with_requests(url, timeout=10):
             result["error_type"] = "network_error"
         result["error_message"] = f"Connection error: {e}"
 
-    except Timeout:
+    except requests.exceptions.Timeout:
         result["error_type"] = "timeout"
         result["error_message"] = "Connection timed out"
 
@@ -170,12 +297,17 @@ def check_with_requests(url, timeout=10):
         result["error_type"] = "unknown"
         result["error_message"] = f"Unexpected error: {type(e).__name__}: {e}"
 
-    result["duration_ms"] = int((time.time() - start_time) * 1000)
+    result["duration_ms"] = (time.perf_counter_ns() - start_time) // 1_000_000
     return result
 
 
-def check_with_ssl_socket(url, timeout=10):
-    """Test SSL connection directly using ssl module."""
+def check_with_ssl_socket(url, timeout=10, keep_open=False, sock=None):
+    """Test SSL connection directly using ssl module.
+
+    With keep_open, a verified connection is left open for the urllib check
+    to reuse instead of being closed. An already connected TCP socket (e.g.
+    from preflight_connect) can be passed as sock to skip connecting again.
+    """
     result = {
         "method": "ssl_socket",
         "success": False,
@@ -186,33 +318,47 @@ def check_with_ssl_socket(url, timeout=10):
     }
 
     # Parse URL
-    from urllib.parse import urlparse
     parsed = urlparse(url)
     host = parsed.hostname
     port = parsed.port or 443
 
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
 
     try:
-        # Create SSL context
-        context = ssl.create_default_context()
+        # Use the shared SSL context
+        context = _SSL_CTX
 
         # Connect
-        with socket.create_connection((host, port), timeout=timeout) as sock:
-            with context.wrap_socket(sock, server_hostname=host) as ssock:
+        if sock is None:
+            sock = socket.create_connection((host, port), timeout=timeout)
+        else:
+            sock.settimeout(timeout)
+
+        with sock:
+            ssock = context.wrap_socket(sock, server_hostname=host)
+            try:
                 result["success"] = True
                 result["ssl_version"] = ssock.version()
                 result["cipher"] = ssock.cipher()
 
+                # Keep the session for the urllib check to resume
+                if ssock.session is not None:
+                    _LAST_SESSION[_connection_key(host, port)] = ssock.session
+
                 # Get certificate info
                 cert = ssock.getpeercert()
                 if cert:
                     result["certificate"] = {
-                        "subject": dict(x[0] for x in cert.get("subject", [])),
-                        "issuer": dict(x[0] for x in cert.get("issuer", [])),
+                        "subject": {k: v for rdn in cert.get("subject", []) for (k, v) in rdn},
+                        "issuer": {k: v for rdn in cert.get("issuer", []) for (k, v) in rdn},
                         "notBefore": cert.get("notBefore"),
                         "notAfter": cert.get("notAfter"),
                     }
+            finally:
+                if keep_open and result["success"]:
+                    _OPEN_SOCKETS[_connection_key(host, port)] = ssock
+                else:
+                    ssock.close()
 
     except ssl.SSLCertVerificationError as e:
         result["error_type"] = "ssl_error"
@@ -239,10 +385,138 @@ def check_with_ssl_socket(url, timeout=10):
         result["error_type"] = "unknown"
         result["error_message"] = f"Unexpected error: {type(e).__name__}: {e}"
 
-    result["duration_ms"] = int((time.time() - start_time) * 1000)
+    result["duration_ms"] = (time.perf_counter_ns() - start_time) // 1_000_000
     return result
 
 
+def preflight_connect(url, timeout=2):
+    """Open a plain TCP connection to the URL's host to detect unreachable hosts early.
+
+    Returns (sock, None) on success or (None, result) where result holds the
+    error_type, error_message and duration_ms shared by every check. Returns
+    (None, None) for non-https URLs, whose HTTP checks use a different port
+    than the ssl socket check, and when a proxy is configured for the URL,
+    since direct connections may be blocked while the proxied checks still
+    work.
+    """
+    parsed = urlparse(url)
+    host = parsed.hostname
+    port = parsed.port or 443
+
+    if not host or parsed.scheme != "https":
+        return None, None
+    if getproxies().get(parsed.scheme) and not proxy_bypass(host):
+        return None, None
+
+    result = {"error_type": "none", "error_message": "", "duration_ms": 0}
+    start_time = time.perf_counter_ns()
+
+    try:
+        return socket.create_connection((host, port), timeout=timeout), None
+
+    except socket.gaierror as e:
+        result["error_type"] = "dns_error"
+        result["error_message"] = f"DNS resolution failed: {e}"
+
+    except socket.timeout:
+        result["error_type"] = "timeout"
+        result["error_message"] = "Connection timed out"
+
+    except ConnectionRefusedError as e:
+        result["error_type"] = "network_error"
+        result["error_message"] = f"Connection refused: {e}"
+
+    except OSError as e:
+        result["error_type"] = "network_error"
+        result["error_message"] = f"Connection failed: {e}"
+
+    result["duration_ms"] = (time.perf_counter_ns() - start_time) // 1_000_000
+    return None, result
+
+
+# Most URLs checked at once in --concurrent-urls mode
+_MAX_CONCURRENT_URLS = 50
+
+
+async def check_all(urls, timeout=10):
+    """Test HTTPS connections to many URLs concurrently over one aiohttp session."""
+    import asyncio
+    import aiohttp
+
+    # Cap in-flight requests at the connector's limit so each URL's timer
+    # starts only once it can actually connect
+    slots = asyncio.Semaphore(_MAX_CONCURRENT_URLS)
+
+    async def check_one(session, url):
+        async with slots:
+            return await check_one_now(session, url)
+
+    async def check_one_now(session, url):
+        result = {
+            "method": "aiohttp",
+            "url": url,
+            "success": False,
+            "error_type": "none",
+            "error_message": "",
+            "duration_ms": 0,
+        }
+
+        start_time = time.perf_counter_ns()
+
+        try:
+            async with session.get(url, headers={"User-Agent": "ssl-diagnostics/1.0"}) as response:
+                result["success"] = True
+                result["status_code"] = response.status
+
+        except aiohttp.ClientSSLError as e:
+            result["error_type"] = "ssl_error"
+            result["error_message"] = f"SSL error: {e}"
+
+        except aiohttp.ClientConnectorError as e:
+            if isinstance(e.os_error, socket.gaierror):
+                result["error_type"] = "dns_error"
+                result["error_message"] = f"DNS resolution failed: {e}"
+            else:
+                result["error_type"] = "network_error"
+                result["error_message"] = f"Connection error: {e}"
+
+        except asyncio.TimeoutError:
+            result["error_type"] = "timeout"
+            result["error_message"] = "Connection timed out"
+
+        except Exception as e:
+            result["error_type"] = "unknown"
+            result["error_message"] = f"Unexpected error: {type(e).__name__}: {e}"
+
+        result["duration_ms"] = (time.perf_counter_ns() - start_time) // 1_000_000
+        return result
+
+    # Bound connect and read rather than the total, which would also count
+    # time spent queued for a connection. trust_env honors HTTPS_PROXY and
+    # NO_PROXY like urllib and requests do
+    connector = aiohttp.TCPConnector(limit=_MAX_CONCURRENT_URLS, ssl=_SSL_CTX)
+    client_timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout,
+                                     trust_env=True) as session:
+        return await asyncio.gather(*[check_one(session, url) for url in urls])
+
+
+def check_urls(urls, timeout=10):
+    """Test many URLs, concurrently with aiohttp or serially with requests as a fallback."""
+    try:
+        import asyncio
+        import aiohttp  # noqa: F401
+    except ImportError:
+        results = []
+        for url in urls:
+            result = check_with_requests(url, timeout)
+            result["url"] = url
+            results.append(result)
+        return results
+
+    return asyncio.run(check_all(urls, timeout))
+
+
 def generate_fix_suggestion(error_type, method):
     """Generate fix suggestions based on error type."""
     if error_type != "ssl_error":
@@ -254,7 +528,7 @@ def generate_fix_suggestion(error_type, method):
         "commands": [],
     }
 
-    if method in ("urllib", "ssl_socket"):
+    if method in ("urllib", "ssl_socket", "aiohttp"):
         fix["description"] = "Set SSL_CERT_FILE environment variable to your CA bundle"
         fix["env_vars"]["SSL_CERT_FILE"] = "/path/to/ca-bundle.crt"
         fix["commands"] = [
@@ -271,37 +545,100 @@ def generate_fix_suggestion(error_type, method):
             "export CURL_CA_BUNDLE=/path/to/ca-bundle.crt",
         ]
 
-    # Try to find system CA bundle
-    ca_paths = [
-        "/etc/ssl/cert.pem",
-        "/etc/ssl/certs/ca-certificates.crt",
-        "/etc/pki/tls/certs/ca-bundle.crt",
-    ]
-    for path in ca_paths:
-        if os.path.exists(path):
-            fix["env_vars"] = {k: path for k in fix["env_vars"]}
-            fix["commands"] = [cmd.replace("/path/to/ca-bundle.crt", path)
-                               for cmd in fix["commands"]]
-            break
+    # Point at the system CA bundle if one was found
+    if _DETECTED_CA_PATH:
+        path = _DETECTED_CA_PATH
+        fix["env_vars"] = {k: path for k in fix["env_vars"]}
+        fix["commands"] = [cmd.replace("/path/to/ca-bundle.crt", path)
+                           for cmd in fix["commands"]]
 
     return fix
 
 
+def dump_json(output, pretty=False):
+    """Serialize output as compact single-line JSON, or indented when pretty."""
+    if pretty:
+        return json.dumps(output, indent=2, default=str)
+    return json.dumps(output, separators=(",", ":"), default=str)
+
+
+def main_concurrent(args, pretty=False):
+    """Entry point for --concurrent-urls: check many URLs and output one JSON document."""
+    if not args:
+        print("Usage: check.py --concurrent-urls URL[,URL...] [TIMEOUT]", file=sys.stderr)
+        sys.exit(2)
+
+    # Parse arguments
+    url_list = sys.stdin.read() if args[0] == "-" else args[0]
+    urls = [u.strip() for u in url_list.replace("\n", ",").split(",") if u.strip()]
+    timeout = int(args[1]) if len(args) > 1 else 10
+
+    python_version = f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
+
+    results = check_urls(urls, timeout)
+    for result in results:
+        result["fix"] = None if result["success"] else \
+            generate_fix_suggestion(result["error_type"], result["method"])
+
+    success = len(results) > 0 and all(r["success"] for r in results)
+
+    output = {
+        "tool": "python",
+        "version": python_version,
+        "urls": urls,
+        "success": success,
+        "error_code": 0 if success else 1,
+        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "results": results,
+    }
+
+    print(dump_json(output, pretty))
+    sys.exit(0 if success else 1)
+
+
 def main():
     """Main entry point."""
-    import platform
+    args = sys.argv[1:]
+    pretty = "--pretty" in args
+    args = [a for a in args if a != "--pretty"]
+
+    if args and args[0] == "--concurrent-urls":
+        return main_concurrent(args[1:], pretty)
 
     # Parse arguments
-    url = sys.argv[1] if len(sys.argv) > 1 else "https://www.google.com"
-    timeout = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    url = args[0] if len(args) > 0 else "https://www.google.com"
+    timeout = int(args[1]) if len(args) > 1 else 10
 
     # Get Python and platform info
     python_version = f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
 
-    # Run checks
-    urllib_result = check_with_urllib(url, timeout)
-    requests_result = check_with_requests(url, timeout)
-    ssl_result = check_with_ssl_socket(url, timeout)
+    # Preflight a TCP connection (also warming the DNS cache) so an
+    # unreachable host fails fast instead of timing out in every check
+    preflight_sock, preflight_error = preflight_connect(url, min(2, timeout))
+
+    if preflight_error:
+        urllib_result = {"method": "urllib", "success": False, **preflight_error}
+        requests_result = {"method": "requests", "success": False, **preflight_error}
+        if _import_requests() is None:
+            requests_result = check_with_requests(url, timeout)
+        ssl_result = {"method": "ssl_socket", "success": False, **preflight_error,
+                      "certificate": None}
+    else:
+        # Run the ssl socket check first, over the preflight connection, so
+        # urllib can send its request over the same verified connection, then
+        # run the remaining I/O-bound checks concurrently - each handles its
+        # own exceptions. requests verifies against its own CA bundle, so it
+        # always makes its own connection
+        ssl_result = check_with_ssl_socket(url, timeout, keep_open=True, sock=preflight_sock)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            urllib_future = executor.submit(check_with_urllib, url, timeout)
+            requests_future = executor.submit(check_with_requests, url, timeout)
+
+            urllib_result = urllib_future.result()
+            requests_result = requests_future.result()
+
+        _close_open_sockets()
 
     # Determine overall success - ALL methods must succeed (or be unavailable)
     # If any method fails with an SSL error, overall status is FAILED
@@ -369,7 +706,7 @@ def main():
     }
 
     # Output JSON
-    print(json.dumps(output, indent=2, default=str))
+    print(dump_json(output, pretty))
 
     # Return appropriate exit code
     sys.exit(0 if success else 1)